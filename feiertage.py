@@ -1,22 +1,42 @@
-from datetime import date, timedelta
+from datetime import date
+from functools import lru_cache
+
 import numpy as np
 import pandas as pd
-
-states_info = pd.read_excel('./states_de.xlsx')
-
-
-def get_monday_date(day):
-    return day - timedelta(days=day.weekday())
-
-
-def get_month_date(day):
-    return date(day.year, day.month, 1)
+from numba import njit, prange, vectorize
+
+# contents of states_de.xlsx, inlined so importing the module does not go
+# through the openpyxl zip/xml parser:
+STATES_DE = {
+    'state': ['Baden-Württemberg', 'Bayern', 'Berlin', 'Brandenburg', 'Bremen',
+              'Hamburg', 'Hessen', 'Mecklenburg-Vorpommern', 'Niedersachsen',
+              'Nordrhein-Westfalen', 'Rheinland-Pfalz', 'Saarland',
+              'Sachsen-Anhalt', 'Sachsen', 'Schleswig-Holstein', 'Thüringen'],
+    'state_code': ['BW', 'BY', 'BE', 'BB', 'HB', 'HH', 'HE', 'MV', 'NI', 'NW',
+                   'RP', 'SL', 'SN', 'ST', 'SH', 'TH'],
+    'population_2020': [11103043, 13140183, 3664088, 2531071, 680130, 1852478,
+                        6293154, 1610774, 8003421, 17925570, 4098391, 983991,
+                        2180684, 4056941, 2910875, 2120237]
+}
+
+
+@lru_cache(maxsize=None)
+def load_states_info():
+    """
+    lazy, cached construction of the states table
+    (population_pct is the population share of each state)
+    """
+    states_info = pd.DataFrame(STATES_DE)
+    states_info['population_pct'] = (
+        states_info['population_2020'] / states_info['population_2020'].sum())
+    return states_info
 
 
-def ostern(year):
+@vectorize(['int64(int64)'], cache=True)
+def _ostern_day_of_march(year):
     """
-    following function calculates the ostern date for a given year:
-    https://de.wikipedia.org/wiki/Gau%C3%9Fsche_Osterformel
+    gauss easter formula: easter sunday as a day-of-march ordinal
+    (values above 31 fall into april); pure integer math, jit-compiled
     """
     A = year % 19
     K = year // 100
@@ -27,12 +47,265 @@ def ostern(year):
     OG = 21 + D + R
     SZ = 7 - (year + year // 4 + S) % 7
     OE = 7 - (OG - SZ) % 7
-    OS = (OG + OE)
-    if OS > 31:
-        ostern_date = np.datetime64(date(year, 4, OS - 31))
+    return OG + OE
+
+
+def ostern(years):
+    """
+    following function calculates the ostern date(s) for the given year(s):
+    https://de.wikipedia.org/wiki/Gau%C3%9Fsche_Osterformel
+    accepts a scalar or an array of years, returns datetime64[D]
+    """
+    years = np.asarray(years, dtype=np.int64)
+    day_of_march = _ostern_day_of_march(years)
+    march = (years - 1970).astype('datetime64[Y]').astype('datetime64[M]') + np.timedelta64(2, 'M')
+    return march.astype('datetime64[D]') + (day_of_march - 1).astype('timedelta64[D]')
+
+
+@njit(parallel=True, cache=True)
+def _build_ft_vot(public_vals, special_vals, weights, late_reform_states,
+                  year, reformationstag, weekday, dates_i8, oct31_2017_i8):
+    """
+    one pass over (states, days) computing the FT and VOT columns:
+    nationwide holidays + state-specific extras, the pre-2018
+    Reformationstag zeroing in HB/HH/NI/SH, the one-off 2017-10-31
+    holiday, and the open-sales-day indicator (sundays excluded)
+    """
+    n_states = weights.shape[0]
+    n_days = public_vals.shape[0]
+    ft = np.empty((n_states, n_days), np.int8)
+    vot = np.empty((n_states, n_days), np.int8)
+    for s in prange(n_states):
+        for i in range(n_days):
+            f = 0
+            for j in range(public_vals.shape[1]):
+                f += public_vals[i, j]
+            for j in range(special_vals.shape[1]):
+                f += special_vals[i, j] * weights[s, j]
+            if late_reform_states[s] and year[i] < 2018 and reformationstag[i] == 1:
+                f = 0
+            if dates_i8[i] == oct31_2017_i8:
+                f = 1
+            ft[s, i] = f
+            vot[s, i] = 0 if weekday[i] == 6 else 1 - f
+    return ft, vot
+
+
+@lru_cache(maxsize=None)
+def _build_timeline(start_date, end_date):
+    """
+    following function creates daily date range with some additional time variables;
+    cached per (start_date, end_date) - callers must not mutate the result
+    """
+    date_range = pd.date_range(start=start_date, end=end_date)
+    timeline = {
+        'date': date_range,
+        'week': date_range.isocalendar().week.astype(np.int16),  # ISO 8601 week number
+        'month': date_range.month.astype(np.int8),
+        'year': date_range.year.astype(np.int16),
+        'day': date_range.day.astype(np.int8),
+        'weekday': date_range.weekday.astype(np.int8)  # The day of the week with Monday=0, Sunday=6.
+    }
+
+    timeline = pd.DataFrame(timeline)
+    # vectorized datetime arithmetic instead of a per-row apply:
+    timeline['monday_date'] = date_range - pd.to_timedelta(date_range.weekday, unit='D')
+    timeline['month_date'] = date_range.to_period('M').to_timestamp()
+    return timeline
+
+
+# specific dates (not public holidays) that are skipped when the handler is
+# created with special_holidays=False:
+SPECIAL_DAYS = ('Silvester', 'Muttertag', 'Valentinstag', 'Nikolaustag')
+
+# horizon of the precomputed per-day holiday table below:
+TABLE_START = date(1970, 1, 1)
+TABLE_END = date(2100, 12, 31)
+
+
+def _holiday_arrays(date_range):
+    """
+    per-day int8 indicator arrays for every holiday known to the handler,
+    in column order (special days included; callers filter by flag)
+    """
+    month = date_range.month.to_numpy()
+    year = date_range.year.to_numpy()
+    day = date_range.day.to_numpy()
+    weekday = date_range.weekday.to_numpy()
+    dates_i8 = date_range.to_numpy().astype('datetime64[D]').view('i8')
+
+    # holidays which are dependent on easter date:
+    ostern_dates = ostern(np.arange(date_range[0].year, date_range[-1].year + 1))
+
+    # holiday name -> offset in days relative to easter sunday:
+    easter_holidays = {
+        'Ostersonntag': 0,
+        'Karfreitag': -2,
+        'Ostermontag': 1,
+        'Christi Himmelfahrt': 39,
+        'Pfingstmontag': 50,
+        'Pfingstsonntag': 49,
+        'Fronleichnam': 60,
+        'Rosenmontag': -48,
+        'Fastnachtsdienstag': -47
+    }
+    # one vectorized isin per holiday instead of a python membership
+    # test per row; compare on the underlying int64 day numbers:
+    holidays = {}
+    ostern_i8 = np.asarray(ostern_dates, dtype='datetime64[D]').view('i8')
+    for name, offset in easter_holidays.items():
+        holidays[name] = np.isin(dates_i8, ostern_i8 + offset).astype(np.int8)
+
+    # public holidays for whole Germany (each country state):
+    holidays['Neujahrstag'] = ((month == 1) & (day == 1)).astype(np.int8)
+    holidays['Maifeiertag'] = ((month == 5) & (day == 1)).astype(np.int8)
+    holidays['Tag der deutschen Einheit'] = ((month == 10) & (day == 3)).astype(np.int8)
+    holidays['Erster Weihnachtstag'] = ((month == 12) & (day == 25)).astype(np.int8)
+    holidays['Zweiter Weihnachtstag'] = ((month == 12) & (day == 26)).astype(np.int8)
+
+    # specific holidays for country states:
+    holidays['Heilige drei Koenige'] = ((month == 1) & (day == 6)).astype(np.int8)
+    holidays['Frauentag'] = ((month == 3) & (day == 8) & (year >= 2019)).astype(np.int8)
+    holidays['Maria Himmelfahrt'] = ((month == 8) & (day == 15)).astype(np.int8)
+
+    holidays['Weltkindertag'] = ((month == 9) & (day == 20) & (year >= 2019)).astype(np.int8)
+    holidays['Reformationstag'] = ((month == 10) & (day == 31)).astype(np.int8)
+    holidays['Allerheiligen'] = ((month == 11) & (day == 1)).astype(np.int8)
+    holidays['Buss- und Bettag'] = (
+        (month == 11) & (day < 23) & (day >= 16) & (weekday == 2)).astype(np.int8)
+
+    # specific dates (not public holidays):
+    holidays['Silvester'] = ((month == 12) & (day == 31)).astype(np.int8)
+    holidays['Muttertag'] = ((month == 5) & (weekday == 6) &
+                             (day >= 8) & (day <= 14)).astype(np.int8)
+    holidays['Valentinstag'] = ((month == 2) & (day == 14)).astype(np.int8)
+    holidays['Nikolaustag'] = ((month == 12) & (day == 6)).astype(np.int8)
+
+    return holidays
+
+
+@lru_cache(maxsize=None)
+def _holiday_table():
+    """
+    the holiday indicators precomputed once over the whole 1970-2100
+    horizon; handlers slice their date range out of these shared arrays
+    """
+    return _holiday_arrays(pd.date_range(TABLE_START, TABLE_END))
+
+
+@lru_cache(maxsize=None)
+def _build_db(start_date, end_date, special_holidays):
+    """
+    for a given time range create a data frame on level of each state;
+    cached per (start_date, end_date, special_holidays) since the result is
+    independent of the aggregation flags and bl_weights. returns the frame
+    plus the tuple of its value columns - callers must not mutate either.
+
+    the whole construction is staged in plain numpy arrays (one per column)
+    and assembled into a DataFrame only once at the end, so no step pays
+    the block-manager cost of repeated db[col] = ... assignments.
+    """
+
+    timeline = _build_timeline(start_date, end_date)
+    year = timeline['year'].to_numpy()
+    weekday = timeline['weekday'].to_numpy()
+    dates_i8 = timeline['date'].to_numpy().astype('datetime64[D]').view('i8')
+
+    # holiday indicators: slice the requested range out of the precomputed
+    # 1970-2100 table; ranges beyond the horizon are computed directly
+    start_ts, end_ts = pd.Timestamp(start_date), pd.Timestamp(end_date)
+    if pd.Timestamp(TABLE_START) <= start_ts and end_ts <= pd.Timestamp(TABLE_END):
+        i0 = (start_ts - pd.Timestamp(TABLE_START)).days
+        table = {name: values[i0:i0 + len(timeline)]
+                 for name, values in _holiday_table().items()}
     else:
-        ostern_date = np.datetime64(date(year, 3, OS))
-    return ostern_date
+        table = _holiday_arrays(pd.DatetimeIndex(timeline['date']))
+    holidays = {name: values for name, values in table.items()
+                if special_holidays or name not in SPECIAL_DAYS}
+
+    # states_df is a data frame with information about states:
+    states_df = load_states_info()[['state', 'state_code']]
+    state_codes = states_df['state_code'].to_numpy()
+    n_states = len(states_df)
+    n_days = len(timeline)
+
+    # Public Holidays in each state of Germany:
+    public_german_holidays = [
+        'Neujahrstag',
+        'Karfreitag',
+        'Ostermontag',
+        'Maifeiertag',
+        'Christi Himmelfahrt',
+        'Pfingstmontag',
+        'Tag der deutschen Einheit',
+        'Erster Weihnachtstag',
+        'Zweiter Weihnachtstag'
+    ]
+    # Special Holidays: individual for each state:
+    states_holidays = {
+        'BW': ['Heilige drei Koenige', 'Fronleichnam', 'Allerheiligen'],
+        'BY': ['Heilige drei Koenige', 'Fronleichnam', 'Maria Himmelfahrt', 'Allerheiligen', 'Buss- und Bettag'],
+        'BE': ['Frauentag'],
+        'BB': ['Ostersonntag', 'Pfingstsonntag', 'Reformationstag'],
+        'HB': ['Reformationstag'],
+        'HH': ['Reformationstag'],
+        'HE': ['Ostersonntag', 'Pfingstsonntag', 'Fronleichnam'],
+        'MV': ['Reformationstag'],
+        'NI': ['Reformationstag'],
+        'NW': ['Fronleichnam', 'Allerheiligen'],
+        'RP': ['Fronleichnam', 'Allerheiligen'],
+        'SL': ['Fronleichnam', 'Allerheiligen', 'Maria Himmelfahrt'],
+        'SN': ['Fronleichnam', 'Buss- und Bettag', 'Reformationstag'],
+        'ST': ['Heilige drei Koenige', 'Reformationstag'],
+        'SH': ['Reformationstag'],
+        'TH': ['Fronleichnam', 'Weltkindertag', 'Reformationstag']
+    }
+    # a 16 x H indicator matrix says which special holiday counts in which
+    # state; one matmul against the per-day H columns yields every state's
+    # extra contribution as a (states, days) block:
+    special_names = list(dict.fromkeys(
+        name for names in states_holidays.values() for name in names))
+    weights = np.zeros((n_states, len(special_names)), dtype=np.int8)
+    for i, state_code in enumerate(state_codes):
+        for name in states_holidays.get(state_code, []):
+            weights[i, special_names.index(name)] = 1
+
+    # the remaining hot work - nationwide sum, state extras, the pre-2018
+    # Reformationstag rule (first since 2018 in Bremen, Hamburg,
+    # Niedersachsen und Schleswig-Holstein), the one-off nationwide holiday
+    # on 2017-10-31 (500th anniversary of the reformation) and the
+    # open-sales-day column (VOT = verkaufsoffene Tage) - is pure integer
+    # arithmetic on contiguous int8 arrays and runs in one parallel numba
+    # kernel over the (states, days) block:
+    public_vals = np.column_stack([holidays[name] for name in public_german_holidays])
+    special_vals = np.column_stack([holidays[name] for name in special_names])
+    late_reform_states = np.isin(state_codes, ['HB', 'HH', 'NI', 'SH'])
+    oct31_2017_i8 = np.datetime64(date(2017, 10, 31), 'D').astype('i8')
+    ft, vot = _build_ft_vot(public_vals, special_vals, weights, late_reform_states,
+                            year, holidays['Reformationstag'], weekday,
+                            dates_i8, oct31_2017_i8)
+
+    # crossjoin states x days by direct construction (repeat the state
+    # columns, tile the day columns), assembled into a DataFrame in one go:
+    db = {
+        'state': np.repeat(states_df['state'].to_numpy(), n_days),
+        # categorical: 16 distinct codes, so groupbys/joins work on int8 codes
+        'state_code': pd.Categorical(np.repeat(state_codes, n_days),
+                                     categories=state_codes)
+    }
+    for col in timeline.columns:
+        db[col] = np.tile(timeline[col].to_numpy(), n_states)
+    for name, values in holidays.items():
+        db[name] = np.tile(values, n_states)
+    db['FT'] = ft.reshape(-1)
+    db['VOT'] = vot.reshape(-1)
+    db = pd.DataFrame(db)
+
+    # value columns (everything except keys and calendar helpers),
+    # resolved once so report() does not rebuild column lists per step:
+    value_columns = tuple(holidays) + ('FT', 'VOT')
+
+    return db, value_columns
 
 
 class FeiertagHandler:
@@ -50,11 +323,11 @@ class FeiertagHandler:
         self.count_sundays = count_sundays
         self.special_holidays = special_holidays
 
-        global states_info  # TODO: better define in config-files
-        self.states_info = states_info
-
+        # custom weights go into a new frame: the loaded table is shared
+        # between instances and must never be mutated
+        self.states_info = load_states_info()
         if bl_weights:
-            self.states_info['population_pct'] = bl_weights
+            self.states_info = self.states_info.assign(population_pct=bl_weights)
 
         # reporting:
         self.db = self.create_db()
@@ -64,138 +337,18 @@ class FeiertagHandler:
         """
         following function creates daily date range with some additional time variables
         """
-        date_range = pd.date_range(start=self.start_date, end=self.end_date)
-        timeline = {
-            'date': date_range,
-            'week': date_range.strftime("%V"),  # ISO 8601 week as a decimal number
-            'month': date_range.strftime("%m"),
-            'year': date_range.strftime("%Y"),
-            'day': date_range.strftime("%d"),
-            'weekday': date_range.weekday  # The day of the week with Monday=0, Sunday=6.
-        }
-
-        timeline = pd.DataFrame(timeline)
-        timeline['monday_date'] = timeline.apply(lambda x: get_monday_date(x['date']), axis=1)
-        timeline['month_date'] = timeline.apply(lambda x: get_month_date(x['date']), axis=1)
-        return timeline
+        return _build_timeline(self.start_date, self.end_date).copy()
 
     def create_db(self):
         """
-        for a given time range create a data frame on level of each state
+        for a given time range create a data frame on level of each state;
+        memoized per (start_date, end_date, special_holidays), so repeated
+        handlers over the same range reuse the cached frame
         """
-
-        db = self.create_timeline()
-
-        # holidays which are dependent on easter date:
-        ostern_dates = [ostern(i) for i in
-                        range(int(self.start_date.strftime("%Y")), int(self.end_date.strftime("%Y")) + 1)]
-
-        # db['Ostersonntag'] = db.apply(lambda x: 1 if x['date'] in ostern_dates else 0, axis=1) # slow version
-        db['Ostersonntag'] = [1 if date in ostern_dates else 0 for date in db['date']]
-        db['Karfreitag'] = [1 if date in list(ostern_dates - np.timedelta64(2, 'D')) else 0 for date in db['date']]
-        db['Ostermontag'] = [1 if date in list(ostern_dates + np.timedelta64(1, 'D')) else 0 for date in db['date']]
-        db['Christi Himmelfahrt'] = [1 if date in list(ostern_dates + np.timedelta64(39, 'D')) else 0 for date in
-                                     db['date']]
-        db['Pfingstmontag'] = [1 if date in list(ostern_dates + np.timedelta64(50, 'D')) else 0 for date in db['date']]
-        db['Pfingstsonntag'] = [1 if date in list(ostern_dates + np.timedelta64(49, 'D')) else 0 for date in db['date']]
-        db['Fronleichnam'] = [1 if date in list(ostern_dates + np.timedelta64(60, 'D')) else 0 for date in db['date']]
-        db['Rosenmontag'] = [1 if date in list(ostern_dates - np.timedelta64(48, 'D')) else 0 for date in db['date']]
-        db['Fastnachtsdienstag'] = [1 if date in list(ostern_dates - np.timedelta64(47, 'D')) else 0 for date in
-                                    db['date']]
-
-        # public holidays for whole Germany (each country state):
-        # slow version:
-        # db['Neujahrstag'] = db.apply(lambda x: 1 if ((x['month']=='01') & (x['day']=='01')) else 0, axis=1)
-        db['Neujahrstag'] = np.where((db['month'] == '01') & (db['day'] == '01'), 1, 0)
-        db['Maifeiertag'] = np.where((db['month'] == '05') & (db['day'] == '01'), 1, 0)
-        db['Tag der deutschen Einheit'] = np.where((db['month'] == '10') & (db['day'] == '03'), 1, 0)
-        db['Erster Weihnachtstag'] = np.where((db['month'] == '12') & (db['day'] == '25'), 1, 0)
-        db['Zweiter Weihnachtstag'] = np.where((db['month'] == '12') & (db['day'] == '26'), 1, 0)
-
-        # specific holidays for country states:
-        db['Heilige drei Koenige'] = np.where((db['month'] == '01') & (db['day'] == '06'), 1, 0)
-        db['Frauentag'] = np.where((db['month'] == '03') & (db['day'] == '08') & (db['year'] >= '2019'), 1, 0)
-        db['Maria Himmelfahrt'] = np.where((db['month'] == '08') & (db['day'] == '15'), 1, 0)
-
-        db['Weltkindertag'] = np.where((db['month'] == '09') & (db['day'] == '20') & (db['year'] >= '2019'), 1, 0)
-        db['Reformationstag'] = np.where((db['month'] == '10') & (db['day'] == '31'), 1, 0)
-        db['Allerheiligen'] = np.where((db['month'] == '11') & (db['day'] == '01'), 1, 0)
-        db['Buss- und Bettag'] = np.where(
-            (db['month'] == '11') & (db['day'] < '23') & (db['day'] >= '16') & (db['weekday'] == 2), 1, 0)
-
-        if self.special_holidays:
-            # specific dates (not public holidays):
-            db['Silvester'] = np.where((db['month'] == '12') & (db['day'] == '31'), 1, 0)
-            db['Muttertag'] = np.where((db['month'] == '05') & (db['weekday'] == 6) &
-                                       (db['day'] >= '08') & (db['day'] <= '14'), 1, 0)
-            db['Valentinstag'] = np.where((db['month'] == '02') & (db['day'] == '14'), 1, 0)
-            db['Nikolaustag'] = np.where((db['month'] == '12') & (db['day'] == '06'), 1, 0)
-
-        # states_df is a data frame with information about states:
-        states_df = self.states_info[['state', 'state_code']].copy()
-
-        # create key column for purpose of crossjoin:
-        db['key'] = 0
-        states_df['key'] = 0
-        db = pd.merge(states_df, db, how='outer').drop(['key'], axis=1)
-
-        # Public Holidays in each state of Germany:
-        public_german_holidays = [
-            'Neujahrstag',
-            'Karfreitag',
-            'Ostermontag',
-            'Maifeiertag',
-            'Christi Himmelfahrt',
-            'Pfingstmontag',
-            'Tag der deutschen Einheit',
-            'Erster Weihnachtstag',
-            'Zweiter Weihnachtstag'
-        ]
-        db['FT'] = 0
-        for feiertag in public_german_holidays:
-            db['FT'] += db[feiertag]  # add each german official holiday
-
-        # Special Holidays: individual for each state:
-        states_holidays = {
-            'BW': ['Heilige drei Koenige', 'Fronleichnam', 'Allerheiligen'],
-            'BY': ['Heilige drei Koenige', 'Fronleichnam', 'Maria Himmelfahrt', 'Allerheiligen', 'Buss- und Bettag'],
-            'BE': ['Frauentag'],
-            'BB': ['Ostersonntag', 'Pfingstsonntag', 'Reformationstag'],
-            'HB': ['Reformationstag'],
-            'HH': ['Reformationstag'],
-            'HE': ['Ostersonntag', 'Pfingstsonntag', 'Fronleichnam'],
-            'MV': ['Reformationstag'],
-            'NI': ['Reformationstag'],
-            'NW': ['Fronleichnam', 'Allerheiligen'],
-            'RP': ['Fronleichnam', 'Allerheiligen'],
-            'SL': ['Fronleichnam', 'Allerheiligen', 'Maria Himmelfahrt'],
-            'SN': ['Fronleichnam', 'Buss- und Bettag', 'Reformationstag'],
-            'ST': ['Heilige drei Koenige', 'Reformationstag'],
-            'SH': ['Reformationstag'],
-            'TH': ['Fronleichnam', 'Weltkindertag', 'Reformationstag']
-        }
-        for state_code in states_holidays:
-            for special_holiday in states_holidays[state_code]:
-                db['FT'] = np.where(db['state_code'] == state_code, db['FT'] + db[special_holiday], db['FT'])
-
-        # Reformationstag first since 2018 in Bremen, Hamburg, Niedersachsen und Schleswig-Holstein
-        # Before that it should be zero:
-        db['FT'] = np.where(
-            (db['year'] < '2018') & (db['Reformationstag'] == 1) & (
-                db['state_code'].isin(['HB', 'HH', 'NI', 'SH'])), 0,
-            db['FT'])
-
-        # frow wikipedia:
-        # Der 31. Oktober 2017 wurde im Gedenken an das 500. Jubiläum des Beginns
-        # der Reformation einmalig als gesamtdeutscher Feiertag begangen.
-        # Entsprechende Gesetze bzw. Verordnungen wurden von allen Bundesländern erlassen,
-        # in denen der Reformationstag nicht ohnehin Feiertag ist.
-        db['FT'] = np.where(db['date'] == date(2017, 10, 31), 1, db['FT'])
-
-        # Open sales days (VOT = verkaufsoffene Tage):
-        db['VOT'] = np.where(db['weekday'] != 6, 1 - db['FT'], 0)  # exclude sundays
-
-        return db
+        db, value_columns = _build_db(self.start_date, self.end_date, self.special_holidays)
+        self.value_columns = list(value_columns)
+        # copy: report() adjusts the frame in place and must not touch the cache
+        return db.copy()
 
     def report(self):
         """
@@ -216,26 +369,64 @@ class FeiertagHandler:
             print("wrong aggregation")
 
         db['date'] = db[var]
-        db = db.drop(['day', 'month', 'week', 'year', 'weekday', 'monday_date', 'month_date'], 1)
+        db = db.drop(columns=['day', 'month', 'week', 'year', 'weekday', 'monday_date', 'month_date'])
 
         # aggregation on time-level:
-        db = db.groupby(['state', 'state_code', 'date'], as_index=False).sum()
-
-        # aggregation on DE-level:
+        # for "day" the crossjoin already guarantees one row per (state, date),
+        # so the groupby would be an expensive no-op; the frame is already
+        # sorted by (state_code, date). only the weekly report aggregates.
+        if self.time_agg == "week":
+            n_days = (self.end_date - self.start_date).days + 1
+            if self.start_date.weekday() == 0 and n_days % 7 == 0:
+                # the range covers whole monday-to-sunday weeks, so each week
+                # is exactly 7 consecutive rows per state: sum via a stride
+                # reshape instead of a hash-based groupby
+                n_weeks = n_days // 7
+                n_states = len(self.states_info)
+                value_cols = self.value_columns
+                weekly = db[value_cols].to_numpy(dtype=np.int64).reshape(
+                    n_states, n_weeks, 7, len(value_cols)).sum(axis=2)
+                out = {
+                    'state': np.repeat(self.states_info['state'].to_numpy(), n_weeks),
+                    'state_code': pd.Categorical(
+                        np.repeat(self.states_info['state_code'].to_numpy(), n_weeks),
+                        categories=self.states_info['state_code']),
+                    'date': np.tile(db['date'].to_numpy()[:n_days:7], n_states)
+                }
+                for j, col in enumerate(value_cols):
+                    out[col] = weekly[..., j].reshape(-1)
+                db = pd.DataFrame(out)
+            else:
+                # partial weeks at the edges: keep the groupby
+                db = db.groupby(['state', 'state_code', 'date'],
+                                as_index=False, sort=False, observed=True).sum()
+
+        # aggregation on DE-level: every state block carries the same date
+        # sequence, so the population weighting and the sum over states fuse
+        # into one weighted reduction over a (dates, columns, states) view
+        # instead of a merge + elementwise multiply + groupby. the states
+        # axis is reduced last/contiguously so numpy's pairwise summation
+        # applies and weights adding up to exactly 1.0 stay exactly 1.0:
         if self.geo_agg == "de":
-            db = pd.merge(db, self.states_info[['state', 'population_pct']], on="state")
-            columns_to_multiply = [
-                col for col in list(db.columns) if col not in ['state', 'state_code', 'date', 'population_pct']]
-
-            db[columns_to_multiply] = db[columns_to_multiply].multiply(
-                db["population_pct"], axis="index")
-            db = db.drop(['state', 'state_code', 'population_pct'], 1)
-            db = db.groupby(['date'], as_index=False).sum()
-
-        # convert columns to integer / float:
-        columns_to_integer = [c for c in list(db.columns) if
-                              c not in ('date', 'FT', 'VOT', 'state', 'state_code')]
-        db[columns_to_integer] = db[columns_to_integer].astype('int32')
-        db[['FT', 'VOT']] = db[['FT', 'VOT']].astype('float32')
+            n_states = len(self.states_info)
+            n_dates = len(db) // n_states
+            value_cols = self.value_columns
+            vals = np.ascontiguousarray(
+                db[value_cols].to_numpy(dtype=np.float64)
+                .reshape(n_states, n_dates, len(value_cols))
+                .transpose(1, 2, 0))
+            pop_weights = self.states_info['population_pct'].to_numpy()
+            weighted = (vals * pop_weights).sum(axis=-1)
+
+            de = {'date': db['date'].to_numpy()[:n_dates]}
+            for j, col in enumerate(value_cols):
+                de[col] = weighted[:, j]
+            db = pd.DataFrame(de)
+
+        # convert columns to integer / float in a single astype call instead
+        # of two column-subset assignments:
+        out_dtypes = {c: 'int32' for c in self.value_columns if c not in ('FT', 'VOT')}
+        out_dtypes.update(FT='float32', VOT='float32')
+        db = db.astype(out_dtypes)
 
         return db
\ No newline at end of file